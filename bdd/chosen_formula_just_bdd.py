@@ -17,7 +17,7 @@ def formula(env: Dict[str, int]) -> int:
     return 1 if ((p & q) | r) else 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     var: Optional[str]
     low: int
@@ -7,28 +7,50 @@
 #
 # Prints nodes and edges and writes graphviz.dot
 
-from dataclasses import dataclass
-from typing import Dict, Optional, List
+import sys
+from array import array
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 # Hardcoded formula: (a ∧ ¬c) ∨ (b ⊕ d)
-def formula(env: Dict[str, int]) -> int:
-    a = env["a"]
-    b = env["b"]
-    c = env["c"]
-    d = env["d"]
+# The assignment is a bitmask: bit i of `mask` is the value of var_order[i],
+# i.e. bit 0 = a, bit 1 = c, bit 2 = b, bit 3 = d.
+def _eval_formula(mask: int) -> int:
+    a = mask & 1
+    c = (mask >> 1) & 1
+    b = (mask >> 2) & 1
+    d = (mask >> 3) & 1
 
     left = a & (1 - c)   # a AND (NOT c)
     right = b ^ d        # b XOR d
     return 1 if (left | right) else 0
 
 
-@dataclass
-class Node:
-    # var is None for terminals
-    var: Optional[str]
-    low: int   # child when var = 0
-    high: int  # child when var = 1
+def truth_table(n: int) -> bytes:
+    """Full truth table, one byte per assignment mask."""
+    if np is not None:
+        # One vectorized pass over all masks instead of 2^n Python calls
+        masks = np.arange(1 << n, dtype=np.uint32)
+        a = masks & 1
+        c = (masks >> 1) & 1
+        b = (masks >> 2) & 1
+        d = (masks >> 3) & 1
+        return ((a & (1 - c)) | (b ^ d)).astype(np.uint8).tobytes()
+    return bytes(_eval_formula(m) for m in range(1 << n))
+
+
+# The formula is evaluated once per mask at import time; formula() and the
+# leaves of build are plain byte fetches from then on.
+TABLE = truth_table(4)
+
+
+def formula(mask: int) -> int:
+    return TABLE[mask]
 
 
 class BDD:
@@ -38,79 +60,109 @@ class BDD:
         # Node IDs:
         # 0 = terminal 0
         # 1 = terminal 1
-        self.nodes: List[Node] = [
-            Node(None, 0, 0),  # id 0
-            Node(None, 1, 1),  # id 1
-        ]
-
-    def new_node(self, var: str, low: int, high: int) -> int:
-        nid = len(self.nodes)
-        self.nodes.append(Node(var, low, high))
+        #
+        # Nodes are stored struct-of-arrays: parallel low/high/var arrays
+        # instead of a list of Node objects. var holds the index of the
+        # variable in var_order, -1 for the terminals.
+        #
+        # The columns are preallocated to the worst case (full tree plus
+        # terminals fits in 2^(n+1) slots) and n_nodes is the write cursor,
+        # so building never triggers an append/realloc.
+        cap = 1 << (len(var_order) + 1)
+        self.low = array("i", [0] * cap)
+        self.high = array("i", [0] * cap)
+        self.var = array("h", [-1] * cap)
+        self.low[1] = 1
+        self.high[1] = 1
+        self.n_nodes = 2
+
+        # Precomputed at import; leaves in build are a single byte fetch.
+        self.table = TABLE
+
+    def new_node(self, var_idx: int, low: int, high: int) -> int:
+        nid = self.n_nodes
+        self.low[nid] = low
+        self.high[nid] = high
+        self.var[nid] = var_idx
+        self.n_nodes = nid + 1
         return nid
 
-    def build(self, idx: int, env_partial: Dict[str, int]) -> int:
-        # If we assigned all variables, evaluate the formula and return 0/1 terminal
-        if idx == len(self.var_order):
-            val = formula(env_partial)
-            return 1 if val == 1 else 0
-
-        v = self.var_order[idx]
-
-        # Branch v = 0
-        env0 = dict(env_partial)
-        env0[v] = 0
-        low_id = self.build(idx + 1, env0)
-
-        # Branch v = 1
-        env1 = dict(env_partial)
-        env1[v] = 1
-        high_id = self.build(idx + 1, env1)
-
-        # Plain BDD: always create a new node (no merging/reduction yet)
-        return self.new_node(v, low_id, high_id)
+    def build(self, idx: int, mask: int) -> int:
+        # Explicit post-order stack instead of recursion, so no CPython
+        # frame per node and no recursion limit for larger orders.
+        # Phase 0 descends the 0-branch (bit idx stays clear), phase 1 the
+        # 1-branch (bit idx set), phase 2 pops both child ids and creates
+        # the node. Nodes come out in the same order as the old recursion.
+        n = len(self.var_order)
+        table = self.table
+        results: List[int] = []
+        stack = [(idx, mask, 0)]
+        while stack:
+            i, m, phase = stack.pop()
+            if i == n:
+                # All variables assigned: 0/1 terminal from the table
+                results.append(table[m])
+            elif phase == 0:
+                stack.append((i, m, 1))
+                stack.append((i + 1, m, 0))
+            elif phase == 1:
+                stack.append((i, m, 2))
+                stack.append((i + 1, m | (1 << i), 0))
+            else:
+                high_id = results.pop()
+                low_id = results.pop()
+                # Plain BDD: always create a new node (no merging/reduction)
+                results.append(self.new_node(i, low_id, high_id))
+        return results.pop()
 
     def print_nodes_edges(self, root: int) -> None:
-        print("BDD (not reduced)")
-        print("Variable order:", self.var_order)
-        print("Root id:", root)
-        print()
-
-        print("NODES:")
-        print("  0: TERMINAL 0")
-        print("  1: TERMINAL 1")
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            print(f"  {nid}: var={n.var}, low={n.low}, high={n.high}")
-
-        print()
-        print("EDGES:")
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            print(f"  {nid} --0--> {n.low}")
-            print(f"  {nid} --1--> {n.high}")
+        # Collect all lines and emit them with one write, instead of a
+        # flushing print call (and syscall) per line.
+        var_order, var, low, high = self.var_order, self.var, self.low, self.high
+        n_nodes = self.n_nodes
+        lines = [
+            "BDD (not reduced)",
+            "Variable order: {}".format(var_order),
+            "Root id: {}".format(root),
+            "",
+            "NODES:",
+            "  0: TERMINAL 0",
+            "  1: TERMINAL 1",
+        ]
+        lines += [
+            "  {}: var={}, low={}, high={}".format(
+                nid, var_order[var[nid]], low[nid], high[nid]
+            )
+            for nid in range(2, n_nodes)
+        ]
+        lines += ["", "EDGES:"]
+        for nid in range(2, n_nodes):
+            lines.append("  {} --0--> {}".format(nid, low[nid]))
+            lines.append("  {} --1--> {}".format(nid, high[nid]))
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def write_dot(self, root: int, filename: str = "graphviz.dot") -> None:
-        lines: List[str] = []
-        lines.append("digraph BDD {")
-        lines.append("  rankdir=TB;")
-        lines.append('  0 [shape=box,label="0"];')
-        lines.append('  1 [shape=box,label="1"];')
-
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            lines.append(f'  {nid} [label="{n.var}"];')
-
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            lines.append(f'  {nid} -> {n.low} [label="0",style=dashed];')
-            lines.append(f'  {nid} -> {n.high} [label="1"];')
-
-        lines.append('  root [shape=plaintext,label="root"];')
-        lines.append(f"  root -> {root};")
-        lines.append("}")
-
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
+        # Stream lines straight to the (buffered) file instead of holding
+        # the whole document in memory and joining it at the end.
+        var_order, var, low, high = self.var_order, self.var, self.low, self.high
+        n_nodes = self.n_nodes
+        with open(filename, "w", encoding="utf-8", buffering=1 << 20) as f:
+            w = f.write
+            w("digraph BDD {\n")
+            w("  rankdir=TB;\n")
+            w('  0 [shape=box,label="0"];\n')
+            w('  1 [shape=box,label="1"];\n')
+
+            for nid in range(2, n_nodes):
+                w(f'  {nid} [label="{var_order[var[nid]]}"];\n')
+
+            for nid in range(2, n_nodes):
+                w(f'  {nid} -> {low[nid]} [label="0",style=dashed];\n')
+                w(f'  {nid} -> {high[nid]} [label="1"];\n')
+
+            w('  root [shape=plaintext,label="root"];\n')
+            w(f"  root -> {root};\n")
+            w("}")
 
         print()
         print(f"Wrote {filename}")
@@ -120,6 +172,6 @@ if __name__ == "__main__":
     order = ["a", "c", "b", "d"]
     bdd = BDD(order)
 
-    root_id = bdd.build(0, {})
+    root_id = bdd.build(0, 0)
     bdd.print_nodes_edges(root_id)
     bdd.write_dot(root_id, "graphviz.dot")
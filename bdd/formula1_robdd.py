@@ -13,28 +13,97 @@
 # - prints nodes and edges
 # - writes graphviz.dot
 
-from dataclasses import dataclass
-from typing import Dict, Optional, List, Tuple
+import sys
+from array import array
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional JIT fast path: with numba installed the whole build runs as
+# native code over int arrays. The scripts stay dependency-free without it.
+try:
+    from numba import njit, types
+    from numba.typed import Dict as NumbaDict
+except ImportError:
+    _build_kernel = None
+else:
+    @njit(cache=True)
+    def _build_kernel(table, n):
+        # Same algorithm as ROBDD.build/mk below: bottom-up over the truth
+        # table, unique table keyed on the packed (var_idx, high, low) int.
+        cap = 1 << (n + 1)
+        low = np.empty(cap, np.int32)
+        high = np.empty(cap, np.int32)
+        var = np.empty(cap, np.int16)
+        low[0] = 0
+        low[1] = 1
+        high[0] = 0
+        high[1] = 1
+        var[0] = -1
+        var[1] = -1
+        n_nodes = 2
+
+        tbl = NumbaDict.empty(types.int64, types.int64)
+        layer = table.astype(np.int64)
+        for k in range(n - 1, -1, -1):
+            new_layer = np.empty(1 << k, np.int64)
+            for i in range(1 << k):
+                lo = layer[i]
+                hi = layer[i | (1 << k)]
+                if lo == hi:
+                    new_layer[i] = lo  # Rule (1)
+                    continue
+                key = (k << 44) | (hi << 22) | lo
+                if key in tbl:
+                    new_layer[i] = tbl[key]  # Rule (2)
+                else:
+                    low[n_nodes] = lo
+                    high[n_nodes] = hi
+                    var[n_nodes] = k
+                    tbl[key] = n_nodes
+                    new_layer[i] = n_nodes
+                    n_nodes += 1
+            layer = new_layer
+        return low[:n_nodes], high[:n_nodes], var[:n_nodes], layer[0]
 
 
 # Hardcoded formula: (a ∧ ¬c) ∨ (b ⊕ d)
-def formula(env: Dict[str, int]) -> int:
-    a = env["a"]
-    b = env["b"]
-    c = env["c"]
-    d = env["d"]
+# The assignment is a bitmask: bit i of `mask` is the value of var_order[i],
+# i.e. bit 0 = a, bit 1 = c, bit 2 = b, bit 3 = d.
+def _eval_formula(mask: int) -> int:
+    a = mask & 1
+    c = (mask >> 1) & 1
+    b = (mask >> 2) & 1
+    d = (mask >> 3) & 1
 
     left = a & (1 - c)   # a AND (NOT c)
     right = b ^ d        # b XOR d
     return 1 if (left | right) else 0
 
 
-@dataclass
-class Node:
-    # var is None for terminals
-    var: Optional[str]
-    low: int   # child when var=0
-    high: int  # child when var=1
+def truth_table(n: int) -> bytes:
+    """Full truth table, one byte per assignment mask."""
+    if np is not None:
+        # One vectorized pass over all masks instead of 2^n Python calls
+        masks = np.arange(1 << n, dtype=np.uint32)
+        a = masks & 1
+        c = (masks >> 1) & 1
+        b = (masks >> 2) & 1
+        d = (masks >> 3) & 1
+        return ((a & (1 - c)) | (b ^ d)).astype(np.uint8).tobytes()
+    return bytes(_eval_formula(m) for m in range(1 << n))
+
+
+# The formula is evaluated once per mask at import time; formula() and the
+# bottom layer of build are plain byte fetches from then on.
+TABLE = truth_table(4)
+
+
+def formula(mask: int) -> int:
+    return TABLE[mask]
 
 
 class ROBDD:
@@ -44,117 +113,156 @@ class ROBDD:
         # Node IDs:
         # 0 = terminal 0
         # 1 = terminal 1
-        self.nodes: List[Node] = [
-            Node(None, 0, 0),  # id 0
-            Node(None, 1, 1),  # id 1
-        ]
+        #
+        # Nodes are stored struct-of-arrays: parallel low/high/var arrays
+        # instead of a list of Node objects. var holds the index of the
+        # variable in var_order, -1 for the terminals.
+        #
+        # The columns are preallocated to the worst case (2^(n+1) slots
+        # comfortably bounds the reduced node count) and n_nodes is the
+        # write cursor, so building never triggers an append/realloc.
+        cap = 1 << (len(var_order) + 1)
+        self.low = array("i", [0] * cap)
+        self.high = array("i", [0] * cap)
+        self.var = array("h", [-1] * cap)
+        self.low[1] = 1
+        self.high[1] = 1
+        self.n_nodes = 2
 
         # Rule (2): unique table for merging identical nodes
-        # key = (var, low, high) -> node_id
-        self.unique_table: Dict[Tuple[str, int, int], int] = {}
-
-        # Memoization so we don't rebuild the same subproblem
-        # key = (idx, frozen_partial_assignment) -> node_id
-        self.memo: Dict[Tuple[int, Tuple[Tuple[str, int], ...]], int] = {}
-
-    def mk(self, var: str, low: int, high: int) -> int:
+        # key = (var_idx << 44) | (high << 22) | low -> node_id; packing
+        # the triple into one int hashes in a single C call with no
+        # tuple allocation per probe (22 bits each for the child ids)
+        self.unique_table: Dict[int, int] = {}
+
+        # Precomputed at import; one byte per assignment mask
+        self.table = TABLE
+
+        # Filled in by build: the bottom-up loop creates each level's nodes
+        # contiguously (deepest level first), and level_offsets[k] is the id
+        # of the first node testing var_order[k]. Level k's run ends where
+        # level k-1 starts (n_nodes for k == 0), so per-level scans touch
+        # one contiguous stretch of the node columns.
+        self.level_offsets: List[int] = []
+
+    def mk(self, var_idx: int, low: int, high: int) -> int:
         """
-        Create or reuse a node (var, low, high), applying both ROBDD rules.
+        Create or reuse a node (var_idx, low, high), applying both ROBDD rules.
 
         Rule (1): if low == high, the test is pointless -> return the child.
-        Rule (2): if (var, low, high) already exists -> reuse it.
+        Rule (2): if (var_idx, low, high) already exists -> reuse it.
         """
         if low == high:
             return low  # Rule (1)
 
-        key = (var, low, high)
-        if key in self.unique_table:
-            return self.unique_table[key]  # Rule (2)
-
-        nid = len(self.nodes)
-        self.nodes.append(Node(var, low, high))
-        self.unique_table[key] = nid
+        # One hash probe: get() with a sentinel instead of `in` + `[]`,
+        # with the table bound to a local to skip attribute lookups.
+        tbl = self.unique_table
+        key = (var_idx << 44) | (high << 22) | low
+        nid = tbl.get(key, -1)
+        if nid != -1:
+            return nid  # Rule (2)
+
+        nid = self.n_nodes
+        self.low[nid] = low
+        self.high[nid] = high
+        self.var[nid] = var_idx
+        self.n_nodes = nid + 1
+        tbl[key] = nid
         return nid
 
-    def build(self, idx: int, env_partial: Dict[str, int]) -> int:
+    def build(self) -> int:
         """
-        Shannon expansion in the given variable order:
-        - If all variables assigned, evaluate the formula -> terminal 0/1.
-        - Otherwise split on next variable v:
-            low = build(v=0)
-            high = build(v=1)
-            return mk(v, low, high)  (which reduces/merges)
+        Bottom-up Shannon expansion in the given variable order:
+        - Level n is the truth table itself (terminal ids 0/1).
+        - Level k maps each prefix mask over vars [0..k) to
+          mk(var_k, node for bit k = 0, node for bit k = 1).
+
+        Because the variable order is fixed, every subproblem at level k
+        is identified by its prefix mask, so no memo table is needed:
+        each one is built exactly once by the loop.
+
+        With numba available the loop runs as the compiled _build_kernel
+        instead; the node columns then come back as numpy arrays (the
+        unique table lives inside the kernel in that case).
         """
-        frozen_env = tuple(sorted(env_partial.items()))
-        memo_key = (idx, frozen_env)
-        if memo_key in self.memo:
-            return self.memo[memo_key]
-
-        # Done assigning all vars -> terminal
-        if idx == len(self.var_order):
-            val = formula(env_partial)
-            out = 1 if val == 1 else 0
-            self.memo[memo_key] = out
-            return out
-
-        v = self.var_order[idx]
-
-        # v = 0 branch
-        env0 = dict(env_partial)
-        env0[v] = 0
-        low_id = self.build(idx + 1, env0)
-
-        # v = 1 branch
-        env1 = dict(env_partial)
-        env1[v] = 1
-        high_id = self.build(idx + 1, env1)
-
-        out = self.mk(v, low_id, high_id)
-        self.memo[memo_key] = out
-        return out
+        n = len(self.var_order)
+
+        if _build_kernel is not None:
+            low, high, var, root = _build_kernel(
+                np.frombuffer(self.table, dtype=np.uint8), n
+            )
+            self.low, self.high, self.var = low, high, var
+            self.n_nodes = len(low)
+            # The kernel lays nodes out level-major too; recover each
+            # level's start from the (non-increasing) var column.
+            offsets = [0] * n
+            nid = 2
+            for k in range(n - 1, -1, -1):
+                offsets[k] = nid
+                while nid < len(var) and var[nid] == k:
+                    nid += 1
+            self.level_offsets = offsets
+            return int(root)
+
+        self.level_offsets = [0] * n
+        layer = list(self.table)
+        for k in reversed(range(n)):
+            self.level_offsets[k] = self.n_nodes
+            layer = [
+                self.mk(k, layer[i], layer[i | (1 << k)])
+                for i in range(1 << k)
+            ]
+        return layer[0]
 
     def print_nodes_edges(self, root: int) -> None:
-        print("ROBDD")
-        print("Variable order:", self.var_order)
-        print("Root id:", root)
-        print()
-
-        print("NODES:")
-        print("  0: TERMINAL 0")
-        print("  1: TERMINAL 1")
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            print(f"  {nid}: var={n.var}, low={n.low}, high={n.high}")
-
-        print()
-        print("EDGES:")
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            print(f"  {nid} --0--> {n.low}")
-            print(f"  {nid} --1--> {n.high}")
+        # Collect all lines and emit them with one write, instead of a
+        # flushing print call (and syscall) per line.
+        var_order, var, low, high = self.var_order, self.var, self.low, self.high
+        n_nodes = self.n_nodes
+        lines = [
+            "ROBDD",
+            "Variable order: {}".format(var_order),
+            "Root id: {}".format(root),
+            "",
+            "NODES:",
+            "  0: TERMINAL 0",
+            "  1: TERMINAL 1",
+        ]
+        lines += [
+            "  {}: var={}, low={}, high={}".format(
+                nid, var_order[var[nid]], low[nid], high[nid]
+            )
+            for nid in range(2, n_nodes)
+        ]
+        lines += ["", "EDGES:"]
+        for nid in range(2, n_nodes):
+            lines.append("  {} --0--> {}".format(nid, low[nid]))
+            lines.append("  {} --1--> {}".format(nid, high[nid]))
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def write_dot(self, root: int, filename: str = "graphviz.dot") -> None:
-        lines: List[str] = []
-        lines.append("digraph ROBDD {")
-        lines.append("  rankdir=TB;")
-        lines.append('  0 [shape=box,label="0"];')
-        lines.append('  1 [shape=box,label="1"];')
-
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            lines.append(f'  {nid} [label="{n.var}"];')
-
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            lines.append(f'  {nid} -> {n.low} [label="0",style=dashed];')
-            lines.append(f'  {nid} -> {n.high} [label="1"];')
-
-        lines.append('  root [shape=plaintext,label="root"];')
-        lines.append(f"  root -> {root};")
-        lines.append("}")
-
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
+        # Stream lines straight to the (buffered) file instead of holding
+        # the whole document in memory and joining it at the end.
+        var_order, var, low, high = self.var_order, self.var, self.low, self.high
+        n_nodes = self.n_nodes
+        with open(filename, "w", encoding="utf-8", buffering=1 << 20) as f:
+            w = f.write
+            w("digraph ROBDD {\n")
+            w("  rankdir=TB;\n")
+            w('  0 [shape=box,label="0"];\n')
+            w('  1 [shape=box,label="1"];\n')
+
+            for nid in range(2, n_nodes):
+                w(f'  {nid} [label="{var_order[var[nid]]}"];\n')
+
+            for nid in range(2, n_nodes):
+                w(f'  {nid} -> {low[nid]} [label="0",style=dashed];\n')
+                w(f'  {nid} -> {high[nid]} [label="1"];\n')
+
+            w('  root [shape=plaintext,label="root"];\n')
+            w(f"  root -> {root};\n")
+            w("}")
 
         print()
         print(f"Wrote {filename}")
@@ -164,6 +272,6 @@ if __name__ == "__main__":
     order = ["a", "c", "b", "d"]
     robdd = ROBDD(order)
 
-    root_id = robdd.build(0, {})
+    root_id = robdd.build()
     robdd.print_nodes_edges(root_id)
     robdd.write_dot(root_id, "graphviz.dot")
@@ -6,16 +6,23 @@
 #
 # Prints nodes and edges, writes graphviz.dot
 
+import sys
+from array import array
 from dataclasses import dataclass
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Optional, List
 
 
-def formula(env: Dict[str, int]) -> int:
-    ones = env["x1"] + env["x2"] + env["x3"] + env["x4"] + env["x5"]
-    return 1 if ones >= 3 else 0
+# The assignment is a bitmask: bit i of `mask` is the value of var_order[i].
+# The formula is evaluated once per mask at import time; formula() is a
+# plain byte fetch from then on.
+TABLE = bytes(int((m & 0x1F).bit_count() >= 3) for m in range(32))
 
 
-@dataclass
+def formula(mask: int) -> int:
+    return TABLE[mask]
+
+
+@dataclass(slots=True)
 class Node:
     var: Optional[str]
     low: int
@@ -29,88 +36,94 @@ class ROBDD:
             Node(None, 0, 0),  # terminal 0
             Node(None, 1, 1),  # terminal 1
         ]
-        self.unique: Dict[Tuple[str, int, int], int] = {}
-        self.memo: Dict[Tuple[int, Tuple[Tuple[str, int], ...]], int] = {}
-
-    def mk(self, var: str, low: int, high: int) -> int:
-        if low == high:
-            return low  # rule 1
-
-        key = (var, low, high)
-        if key in self.unique:
-            return self.unique[key]  # rule 2
-
-        nid = len(self.nodes)
-        self.nodes.append(Node(var, low, high))
-        self.unique[key] = nid
-        return nid
-
-    def build(self, idx: int, env_partial: Dict[str, int]) -> int:
-        frozen = tuple(sorted(env_partial.items()))
-        memo_key = (idx, frozen)
-        if memo_key in self.memo:
-            return self.memo[memo_key]
-
-        if idx == len(self.var_order):
-            out = 1 if formula(env_partial) == 1 else 0
-            self.memo[memo_key] = out
+        # Unique table for merging identical nodes, keyed on the packed
+        # (var_idx, high, low) int (22 bits per child id)
+        self.unique: Dict[int, int] = {}
+
+        # Memoization so we don't rebuild the same subproblem. A subproblem
+        # is fully determined by (idx, bits of mask below idx), so the memo
+        # is a flat array indexed by idx * 2^n + prefix, -1 meaning empty —
+        # no dict, no hashing, no frozen-env tuples.
+        self.n = len(var_order)
+        self.memo = array("i", [-1] * (self.n << self.n))
+
+    def build(self, idx: int, mask: int) -> int:
+        if idx == self.n:
+            return formula(mask)
+
+        slot = (idx << self.n) + (mask & ((1 << idx) - 1))
+        out = self.memo[slot]
+        if out >= 0:
             return out
 
-        v = self.var_order[idx]
-
-        env0 = dict(env_partial)
-        env0[v] = 0
-        low_id = self.build(idx + 1, env0)
-
-        env1 = dict(env_partial)
-        env1[v] = 1
-        high_id = self.build(idx + 1, env1)
-
-        out = self.mk(v, low_id, high_id)
-        self.memo[memo_key] = out
+        # var_order[idx] = 0: bit idx stays clear; = 1: set bit idx
+        low_id = self.build(idx + 1, mask)
+        high_id = self.build(idx + 1, mask | (1 << idx))
+
+        # mk inlined: rule 1 short-circuit, then a single unique-table
+        # probe (rule 2), creating the node only on a miss — one dict
+        # lookup per internal node instead of a call plus two probes.
+        if low_id == high_id:
+            out = low_id  # rule 1
+        else:
+            tbl = self.unique
+            key = (idx << 44) | (high_id << 22) | low_id
+            out = tbl.get(key, -1)
+            if out < 0:
+                out = len(self.nodes)
+                self.nodes.append(Node(self.var_order[idx], low_id, high_id))
+                tbl[key] = out
+        self.memo[slot] = out
         return out
 
     def print_nodes_edges(self, root: int) -> None:
-        print("ROBDD")
-        print("Variable order:", self.var_order)
-        print("Root id:", root)
-        print()
-
-        print("NODES:")
-        print("  0: TERMINAL 0")
-        print("  1: TERMINAL 1")
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            print(f"  {nid}: var={n.var}, low={n.low}, high={n.high}")
-
-        print()
-        print("EDGES:")
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            print(f"  {nid} --0--> {n.low}")
-            print(f"  {nid} --1--> {n.high}")
+        # Collect all lines and emit them with one write, instead of a
+        # flushing print call (and syscall) per line.
+        nodes = self.nodes
+        lines = [
+            "ROBDD",
+            "Variable order: {}".format(self.var_order),
+            "Root id: {}".format(root),
+            "",
+            "NODES:",
+            "  0: TERMINAL 0",
+            "  1: TERMINAL 1",
+        ]
+        lines += [
+            "  {}: var={}, low={}, high={}".format(
+                nid, nodes[nid].var, nodes[nid].low, nodes[nid].high
+            )
+            for nid in range(2, len(nodes))
+        ]
+        lines += ["", "EDGES:"]
+        for nid in range(2, len(nodes)):
+            n = nodes[nid]
+            lines.append("  {} --0--> {}".format(nid, n.low))
+            lines.append("  {} --1--> {}".format(nid, n.high))
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def write_dot(self, root: int, filename: str = "graphviz.dot") -> None:
-        lines: List[str] = []
-        lines.append("digraph ROBDD {")
-        lines.append("  rankdir=TB;")
-        lines.append('  0 [shape=box,label="0"];')
-        lines.append('  1 [shape=box,label="1"];')
-
-        for nid in range(2, len(self.nodes)):
-            lines.append(f'  {nid} [label="{self.nodes[nid].var}"];')
-
-        for nid in range(2, len(self.nodes)):
-            n = self.nodes[nid]
-            lines.append(f'  {nid} -> {n.low} [label="0",style=dashed];')
-            lines.append(f'  {nid} -> {n.high} [label="1"];')
-
-        lines.append('  root [shape=plaintext,label="root"];')
-        lines.append(f"  root -> {root};")
-        lines.append("}")
-
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
+        # Stream lines straight to the (buffered) file instead of holding
+        # the whole document in memory and joining it at the end.
+        nodes = self.nodes
+        with open(filename, "w", encoding="utf-8", buffering=1 << 20) as f:
+            w = f.write
+            w("digraph ROBDD {\n")
+            w("  rankdir=TB;\n")
+            w('  0 [shape=box,label="0"];\n')
+            w('  1 [shape=box,label="1"];\n')
+
+            for nid in range(2, len(nodes)):
+                w(f'  {nid} [label="{nodes[nid].var}"];\n')
+
+            for nid in range(2, len(nodes)):
+                n = nodes[nid]
+                w(f'  {nid} -> {n.low} [label="0",style=dashed];\n')
+                w(f'  {nid} -> {n.high} [label="1"];\n')
+
+            w('  root [shape=plaintext,label="root"];\n')
+            w(f"  root -> {root};\n")
+            w("}")
 
         print()
         print(f"Wrote {filename}")
@@ -119,6 +132,6 @@ class ROBDD:
 if __name__ == "__main__":
     order = ["x1", "x2", "x3", "x4", "x5"]
     robdd = ROBDD(order)
-    root_id = robdd.build(0, {})
+    root_id = robdd.build(0, 0)
     robdd.print_nodes_edges(root_id)
     robdd.write_dot(root_id, "graphviz.dot")
@@ -9,16 +9,21 @@
 # Prints nodes and edges, writes graphviz.dot
 
 from dataclasses import dataclass
-from typing import Dict, Optional, List
+from functools import lru_cache
+from typing import Optional, List
 
 
-def formula(env: Dict[str, int]) -> int:
-    x = (env["x1"] << 2) | (env["x2"] << 1) | env["x3"]
-    y = (env["y1"] << 2) | (env["y2"] << 1) | env["y3"]
+# The assignment is a bitmask: bit i of `mask` is the value of var_order[i],
+# i.e. bits 0-2 = x1 x2 x3 and bits 3-5 = y1 y2 y3. lru_cache memoizes the
+# 64 distinct masks, so each one is evaluated once per run.
+@lru_cache(maxsize=None)
+def formula(mask: int) -> int:
+    x = ((mask & 1) << 2) | (((mask >> 1) & 1) << 1) | ((mask >> 2) & 1)
+    y = (((mask >> 3) & 1) << 2) | (((mask >> 4) & 1) << 1) | ((mask >> 5) & 1)
     return 1 if x > y else 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     var: Optional[str]
     low: int
@@ -38,21 +43,30 @@ class BDD:
         self.nodes.append(Node(var, low, high))
         return nid
 
-    def build(self, idx: int, env_partial: Dict[str, int]) -> int:
-        if idx == len(self.var_order):
-            return 1 if formula(env_partial) == 1 else 0
-
-        v = self.var_order[idx]
-
-        env0 = dict(env_partial)
-        env0[v] = 0
-        low_id = self.build(idx + 1, env0)
-
-        env1 = dict(env_partial)
-        env1[v] = 1
-        high_id = self.build(idx + 1, env1)
-
-        return self.new_node(v, low_id, high_id)
+    def build(self, idx: int, mask: int) -> int:
+        # Explicit post-order stack instead of recursion, so no CPython
+        # frame per node and no recursion limit for larger orders.
+        # Phase 0 descends the 0-branch (bit idx stays clear), phase 1 the
+        # 1-branch (bit idx set), phase 2 pops both child ids and creates
+        # the node. Nodes come out in the same order as the old recursion.
+        n = len(self.var_order)
+        results: List[int] = []
+        stack = [(idx, mask, 0)]
+        while stack:
+            i, m, phase = stack.pop()
+            if i == n:
+                results.append(formula(m))
+            elif phase == 0:
+                stack.append((i, m, 1))
+                stack.append((i + 1, m, 0))
+            elif phase == 1:
+                stack.append((i, m, 2))
+                stack.append((i + 1, m | (1 << i), 0))
+            else:
+                high_id = results.pop()
+                low_id = results.pop()
+                results.append(self.new_node(self.var_order[i], low_id, high_id))
+        return results.pop()
 
     def print_nodes_edges(self, root: int) -> None:
         print("BDD (not reduced)")
@@ -103,6 +117,6 @@ class BDD:
 if __name__ == "__main__":
     order = ["x1", "x2", "x3", "y1", "y2", "y3"]
     bdd = BDD(order)
-    root_id = bdd.build(0, {})
+    root_id = bdd.build(0, 0)
     bdd.print_nodes_edges(root_id)
     bdd.write_dot(root_id, "graphviz.dot")
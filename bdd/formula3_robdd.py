@@ -9,16 +9,21 @@
 # Prints nodes and edges, writes graphviz.dot
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Optional, List, Tuple
 
 
-def formula(env: Dict[str, int]) -> int:
-    x = (env["x1"] << 2) | (env["x2"] << 1) | env["x3"]
-    y = (env["y1"] << 2) | (env["y2"] << 1) | env["y3"]
+# The assignment is a bitmask: bit i of `mask` is the value of var_order[i],
+# i.e. bits 0-2 = x1 x2 x3 and bits 3-5 = y1 y2 y3. lru_cache memoizes the
+# 64 distinct masks, so each one is evaluated once per run.
+@lru_cache(maxsize=None)
+def formula(mask: int) -> int:
+    x = ((mask & 1) << 2) | (((mask >> 1) & 1) << 1) | ((mask >> 2) & 1)
+    y = (((mask >> 3) & 1) << 2) | (((mask >> 4) & 1) << 1) | ((mask >> 5) & 1)
     return 1 if x > y else 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     var: Optional[str]
     low: int
@@ -32,42 +37,37 @@ class ROBDD:
             Node(None, 0, 0),  # terminal 0
             Node(None, 1, 1),  # terminal 1
         ]
-        self.unique: Dict[Tuple[str, int, int], int] = {}
-        self.memo: Dict[Tuple[int, Tuple[Tuple[str, int], ...]], int] = {}
-
-    def mk(self, var: str, low: int, high: int) -> int:
-        if low == high:
-            return low
-        key = (var, low, high)
-        if key in self.unique:
-            return self.unique[key]
-        nid = len(self.nodes)
-        self.nodes.append(Node(var, low, high))
-        self.unique[key] = nid
-        return nid
-
-    def build(self, idx: int, env_partial: Dict[str, int]) -> int:
-        frozen = tuple(sorted(env_partial.items()))
-        memo_key = (idx, frozen)
-        if memo_key in self.memo:
-            return self.memo[memo_key]
+        # Unique table for merging identical nodes, keyed on the packed
+        # (var_idx, high, low) int (22 bits per child id)
+        self.unique: Dict[int, int] = {}
+        # key = (idx, bits of mask below idx) -> node_id
+        self.memo: Dict[Tuple[int, int], int] = {}
 
+    def build(self, idx: int, mask: int) -> int:
         if idx == len(self.var_order):
-            out = 1 if formula(env_partial) == 1 else 0
-            self.memo[memo_key] = out
-            return out
-
-        v = self.var_order[idx]
+            return formula(mask)
 
-        env0 = dict(env_partial)
-        env0[v] = 0
-        low_id = self.build(idx + 1, env0)
-
-        env1 = dict(env_partial)
-        env1[v] = 1
-        high_id = self.build(idx + 1, env1)
+        memo_key = (idx, mask & ((1 << idx) - 1))
+        if memo_key in self.memo:
+            return self.memo[memo_key]
 
-        out = self.mk(v, low_id, high_id)
+        # var_order[idx] = 0: bit idx stays clear; = 1: set bit idx
+        low_id = self.build(idx + 1, mask)
+        high_id = self.build(idx + 1, mask | (1 << idx))
+
+        # mk inlined: rule 1 short-circuit, then a single unique-table
+        # probe (rule 2), creating the node only on a miss — one dict
+        # lookup per internal node instead of a call plus two probes.
+        if low_id == high_id:
+            out = low_id  # rule 1
+        else:
+            tbl = self.unique
+            key = (idx << 44) | (high_id << 22) | low_id
+            out = tbl.get(key, -1)
+            if out < 0:
+                out = len(self.nodes)
+                self.nodes.append(Node(self.var_order[idx], low_id, high_id))
+                tbl[key] = out
         self.memo[memo_key] = out
         return out
 
@@ -120,6 +120,6 @@ class ROBDD:
 if __name__ == "__main__":
     order = ["x1", "x2", "x3", "y1", "y2", "y3"]
     robdd = ROBDD(order)
-    root_id = robdd.build(0, {})
+    root_id = robdd.build(0, 0)
     robdd.print_nodes_edges(root_id)
     robdd.write_dot(root_id, "graphviz.dot")